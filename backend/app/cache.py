@@ -1,96 +1,277 @@
 """
 Simple in-memory cache for transaction analysis results.
 """
+import asyncio
+import heapq
+import threading
 import time
-from typing import Optional, Any, Dict
+from collections import OrderedDict
+from typing import Optional, Any, Awaitable, Callable, Dict, List, Tuple
 from datetime import datetime
 
+from .config import config
+
+# Bound once so the hot get() path skips the attribute lookup; monotonic time
+# is immune to wall-clock jumps and only deltas matter for TTLs
+_now = time.monotonic
+
+# Number of independently locked shards (must be a power of two)
+_NUM_SHARDS = 16
+_SHARD_MASK = _NUM_SHARDS - 1
+
+# Every _SWEEP_INTERVAL sets on a shard, drop up to _SWEEP_BATCH expired entries
+_SWEEP_INTERVAL = 64
+_SWEEP_BATCH = 64
+
+
+class _Shard:
+    """One lock-protected slice of the cache."""
+
+    __slots__ = ("entries", "expiry", "lock", "hits", "misses", "sets_since_sweep")
+
+    def __init__(self):
+        # Entries are (value, expiry) tuples, ordered from least to most recently used
+        self.entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        # Min-heap of (expiry, key); may hold stale entries for overwritten keys
+        self.expiry: List[Tuple[float, str]] = []
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets_since_sweep = 0
+
+    def compact(self) -> None:
+        """
+        Rebuild the expiry heap from live entries; the caller must hold the shard lock.
+
+        LRU evictions, overwrites, and deletes leave stale heap items behind
+        that sweep() only drops once they expire, so without this the heap
+        would grow with every set() for a whole TTL regardless of maxsize.
+        """
+        self.expiry = [(expiry, key) for key, (_, expiry) in self.entries.items()]
+        heapq.heapify(self.expiry)
+
+    def sweep(self, current_time: float, limit: Optional[int] = None) -> int:
+        """
+        Remove expired entries; the caller must hold the shard lock.
+
+        Args:
+            current_time: Time to compare expiries against
+            limit: Maximum number of heap entries to pop, or None for all due
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        popped = 0
+
+        # Only pop entries that are actually due; the heap keeps this O(k log N)
+        while self.expiry and self.expiry[0][0] <= current_time:
+            if limit is not None and popped >= limit:
+                break
+            expiry, key = heapq.heappop(self.expiry)
+            popped += 1
+            entry = self.entries.get(key)
+            # Skip stale heap entries left behind by overwrites or deletes
+            if entry is not None and entry[1] == expiry:
+                del self.entries[key]
+                removed += 1
+
+        return removed
+
 
 class Cache:
-    """In-memory cache with TTL support."""
-    
-    def __init__(self, ttl_seconds: int = 3600):
+    """
+    In-memory LRU cache with TTL support.
+
+    Keys are spread over independently locked shards so concurrent
+    requests for unrelated keys do not contend on a single lock.
+    """
+
+    def __init__(self, ttl_seconds: int = 3600, maxsize: int = 10_000):
         """
         Initialize cache.
-        
+
         Args:
             ttl_seconds: Time-to-live for cache entries in seconds
+            maxsize: Maximum number of entries before least recently used are evicted
         """
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._shards = [_Shard() for _ in range(_NUM_SHARDS)]
         self._ttl_seconds = ttl_seconds
-    
+        # LRU eviction is enforced per shard
+        self._shard_maxsize = max(1, maxsize // _NUM_SHARDS)
+
+    def _shard(self, key: str) -> _Shard:
+        """Get the shard responsible for a key."""
+        return self._shards[hash(key) & _SHARD_MASK]
+
+    @property
+    def hits(self) -> int:
+        """Number of successful lookups."""
+        return sum(shard.hits for shard in self._shards)
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups that found nothing or an expired entry."""
+        return sum(shard.misses for shard in self._shards)
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache if exists and not expired.
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             Cached value or None if not found/expired
         """
-        if key not in self._cache:
-            return None
-        
-        entry = self._cache[key]
-        current_time = time.time()
-        
-        # Check if entry has expired
-        if current_time - entry["timestamp"] > self._ttl_seconds:
-            del self._cache[key]
-            return None
-        
-        return entry["value"]
-    
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.misses += 1
+                return None
+
+            value, expiry = entry
+
+            # Check if entry has expired
+            if expiry <= _now():
+                del shard.entries[key]
+                shard.misses += 1
+                return None
+
+            shard.entries.move_to_end(key)
+            shard.hits += 1
+            return value
+
     def set(self, key: str, value: Any) -> None:
         """
-        Set value in cache with current timestamp.
-        
+        Set value in cache with an expiry of now + TTL, evicting the
+        least recently used entry if the cache is full.
+
+        Expired entries are also swept here in small batches, so no
+        separate cleanup schedule is needed.
+
         Args:
             key: Cache key
             value: Value to cache
         """
-        self._cache[key] = {
-            "value": value,
-            "timestamp": time.time()
-        }
-    
+        current_time = _now()
+        expiry = current_time + self._ttl_seconds
+        shard = self._shard(key)
+        with shard.lock:
+            shard.entries[key] = (value, expiry)
+            shard.entries.move_to_end(key)
+            heapq.heappush(shard.expiry, (expiry, key))
+
+            if len(shard.entries) > self._shard_maxsize:
+                shard.entries.popitem(last=False)
+
+            # Keep the heap proportional to live entries; amortized O(1) per set
+            if len(shard.expiry) > 2 * len(shard.entries) + _SWEEP_BATCH:
+                shard.compact()
+
+            # Amortize expiry cleanup over inserts
+            shard.sets_since_sweep += 1
+            if shard.sets_since_sweep >= _SWEEP_INTERVAL:
+                shard.sets_since_sweep = 0
+                shard.sweep(current_time, _SWEEP_BATCH)
+
     def delete(self, key: str) -> None:
         """
         Delete value from cache.
-        
+
         Args:
             key: Cache key
         """
-        if key in self._cache:
-            del self._cache[key]
-    
+        shard = self._shard(key)
+        with shard.lock:
+            shard.entries.pop(key, None)
+
     def clear(self) -> None:
         """Clear all cache entries."""
-        self._cache.clear()
-    
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.expiry.clear()
+
     def size(self) -> int:
         """Get number of items in cache."""
-        return len(self._cache)
-    
+        return sum(len(shard.entries) for shard in self._shards)
+
     def cleanup_expired(self) -> int:
         """
         Remove all expired entries from cache.
-        
+
         Returns:
             Number of entries removed
         """
-        current_time = time.time()
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if current_time - entry["timestamp"] > self._ttl_seconds
-        ]
-        
-        for key in expired_keys:
-            del self._cache[key]
-        
-        return len(expired_keys)
+        current_time = _now()
+        removed = 0
+
+        # Hold one shard lock at a time so lookups elsewhere keep going
+        for shard in self._shards:
+            with shard.lock:
+                removed += shard.sweep(current_time)
+
+        return removed
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls for the same key.
+
+    The first caller for a key runs the work; callers arriving while it is
+    in flight await the same future instead of repeating the work.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func for key, or wait for the call already in flight.
+
+        Args:
+            key: Key identifying the work
+            func: Zero-argument coroutine function performing the work
+
+        Returns:
+            Result of func, shared by every caller for key
+        """
+        # No await between lookup and insert, so this is race-free on the event loop
+        future = self._inflight.get(key)
+        if future is not None:
+            try:
+                # Shield so a cancelled waiter does not cancel the shared call
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Propagate our own cancellation; if only the leader was
+                # cancelled (e.g. by its timeout), take over the work instead
+                if asyncio.current_task().cancelling() or not future.cancelled():
+                    raise
+            return await self.do(key, func)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged as never retrieved
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
 
 
-# Global cache instance
-transaction_cache = Cache(ttl_seconds=3600)
+# Global cache instances: final responses keyed by network:digest, and
+# Gemini analyses keyed by a hash of the raw transaction data
+transaction_cache = Cache(ttl_seconds=config.CACHE_TTL_SECONDS, maxsize=config.CACHE_MAXSIZE)
+analysis_cache = Cache(ttl_seconds=config.CACHE_TTL_SECONDS, maxsize=config.CACHE_MAXSIZE)
@@ -2,6 +2,7 @@
 Configuration settings for the Suilyzer backend.
 """
 import os
+from dataclasses import dataclass
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -9,42 +10,67 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Application configuration."""
-    
+    """Application configuration, read from the environment once at import."""
+
     # Sui RPC Configuration
-    SUI_RPC_URL: str = os.getenv(
-        "SUI_RPC_URL", 
-        "https://fullnode.mainnet.sui.io:443"
-    )
-    
+    SUI_RPC_URL: str
+    SUI_RPC_MAX_CONCURRENCY: int
+
     # Google Gemini API Configuration
-    GEMINI_API_KEY: Optional[str] = os.getenv("GEMINI_API_KEY")
-    GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
-    
+    GEMINI_API_KEY: Optional[str]
+    GEMINI_MODEL: str
+    GEMINI_TIMEOUT_SECONDS: float
+    GEMINI_BATCH_ENABLED: bool
+    GEMINI_BATCH_MAX_SIZE: int
+    GEMINI_BATCH_MAX_WAIT_MS: int
+
     # Cache Configuration
-    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "3600"))  # 1 hour default
-    
+    CACHE_TTL_SECONDS: int
+    CACHE_MAXSIZE: int
+
     # Server Configuration
-    HOST: str = os.getenv("HOST", "0.0.0.0")
-    PORT: int = int(os.getenv("PORT", "8000"))
-    
-    # CORS Configuration
-    CORS_ORIGINS: list[str] = [
+    HOST: str
+    PORT: int
+
+    # Logging Configuration
+    LOG_LEVEL: str
+    DEBUG: bool
+
+    # CORS Configuration (immutable, built once)
+    CORS_ORIGINS: tuple[str, ...] = (
         "http://localhost:8000",
         "http://localhost:3000",
         "http://127.0.0.1:8000",
         "http://127.0.0.1:3000",
-    ]
-    
-    @classmethod
-    def validate(cls) -> None:
+    )
+
+    def validate(self) -> None:
         """Validate required configuration."""
-        if not cls.GEMINI_API_KEY:
+        if not self.GEMINI_API_KEY:
             raise ValueError(
                 "GEMINI_API_KEY environment variable is required. "
                 "Get your API key from https://makersuite.google.com/app/apikey"
             )
 
 
-config = Config()
+config = Config(
+    SUI_RPC_URL=os.getenv("SUI_RPC_URL", "https://fullnode.mainnet.sui.io:443"),
+    SUI_RPC_MAX_CONCURRENCY=int(os.getenv("SUI_RPC_MAX_CONCURRENCY", "50")),
+    GEMINI_API_KEY=os.getenv("GEMINI_API_KEY"),
+    GEMINI_MODEL=os.getenv("GEMINI_MODEL", "gemini-1.5-flash"),
+    GEMINI_TIMEOUT_SECONDS=float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60")),
+    GEMINI_BATCH_ENABLED=os.getenv("GEMINI_BATCH_ENABLED", "false").lower() in ("1", "true", "yes"),
+    GEMINI_BATCH_MAX_SIZE=int(os.getenv("GEMINI_BATCH_MAX_SIZE", "8")),
+    GEMINI_BATCH_MAX_WAIT_MS=int(os.getenv("GEMINI_BATCH_MAX_WAIT_MS", "25")),
+    CACHE_TTL_SECONDS=int(os.getenv("CACHE_TTL_SECONDS", "3600")),  # 1 hour default
+    CACHE_MAXSIZE=int(os.getenv("CACHE_MAXSIZE", "2048")),
+    HOST=os.getenv("HOST", "0.0.0.0"),
+    PORT=int(os.getenv("PORT", "8000")),
+    LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO"),
+    DEBUG=os.getenv("DEBUG", "false").lower() in ("1", "true", "yes"),
+)
+
+# Fail fast on missing required settings
+config.validate()
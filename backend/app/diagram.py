@@ -1,11 +1,34 @@
 """
 Generate visual diagram data from transaction information.
 """
-from typing import Dict, Any, List, Set
+from functools import lru_cache
+from typing import Dict, Any, List
 from .schemas import DiagramNode, DiagramEdge, DiagramData
 from .utils import truncate_address
 
 
+# Object change section -> (node label prefix, edge label, edge type)
+_OBJECT_SECTIONS = {
+    "created": ("New: ", "created", "creation"),
+    "mutated": ("Modified: ", "modified", "mutation"),
+    "deleted": ("Deleted: ", "deleted", "deletion"),
+}
+
+
+@lru_cache(maxsize=4096)
+def _type_label(object_type: str) -> str:
+    """
+    Get short display name for an object type.
+    
+    Args:
+        object_type: Full object type like "0x2::coin::Coin<0x2::sui::SUI>"
+        
+    Returns:
+        Last "::" segment, truncated to 20 characters
+    """
+    return object_type.rpartition("::")[2][:20]
+
+
 class DiagramGenerator:
     """Generate diagram data for transaction visualization."""
     
@@ -19,9 +42,9 @@ class DiagramGenerator:
         """
         self.transaction_data = transaction_data
         self.parsed_data = parsed_data
-        self.nodes: List[DiagramNode] = []
+        # Keyed by node ID, which also de-duplicates nodes
+        self.nodes: Dict[str, DiagramNode] = {}
         self.edges: List[DiagramEdge] = []
-        self.node_ids: Set[str] = set()
     
     def _add_node(self, node_id: str, label: str, node_type: str) -> None:
         """
@@ -32,13 +55,13 @@ class DiagramGenerator:
             label: Display label
             node_type: Node type (address, object, package)
         """
-        if node_id not in self.node_ids:
-            self.nodes.append(DiagramNode(
+        if node_id not in self.nodes:
+            # Inputs are our own strings, so skip validation
+            self.nodes[node_id] = DiagramNode.model_construct(
                 id=node_id,
                 label=label,
                 type=node_type
-            ))
-            self.node_ids.add(node_id)
+            )
     
     def _add_edge(self, source: str, target: str, label: str, edge_type: str) -> None:
         """
@@ -50,7 +73,7 @@ class DiagramGenerator:
             label: Edge label
             edge_type: Edge type (transfer, mutation, creation, deletion)
         """
-        self.edges.append(DiagramEdge(
+        self.edges.append(DiagramEdge.model_construct(
             source=source,
             target=target,
             label=label,
@@ -66,9 +89,10 @@ class DiagramGenerator:
         """
         # Add sender node
         sender = self.parsed_data.get("sender")
+        sender_node = f"addr_{sender}" if sender else None
         if sender:
             self._add_node(
-                f"addr_{sender}",
+                sender_node,
                 truncate_address(sender),
                 "address"
             )
@@ -96,7 +120,7 @@ class DiagramGenerator:
             # Connect sender to package
             if sender:
                 self._add_edge(
-                    f"addr_{sender}",
+                    sender_node,
                     package_node_id,
                     "calls",
                     "mutation"
@@ -114,7 +138,7 @@ class DiagramGenerator:
                 # Receiving
                 if sender:
                     self._add_edge(
-                        f"addr_{sender}",
+                        sender_node,
                         target_node,
                         f"+{formatted_amount}",
                         "transfer"
@@ -126,80 +150,43 @@ class DiagramGenerator:
         # Add object nodes and edges
         object_changes = self.parsed_data.get("object_changes", {})
         
-        # Created objects
-        for obj in object_changes.get("created", []):
-            obj_id = obj["object_id"]
-            obj_node_id = f"obj_{obj_id}"
-            
-            # Extract simple type name
-            obj_type = obj["object_type"]
-            type_label = obj_type.split("::")[-1][:20]  # Last part, truncated
-            
-            self._add_node(obj_node_id, f"New: {type_label}", "object")
-            
-            # Connect from sender or package
-            if sender:
-                self._add_edge(
-                    f"addr_{sender}",
-                    obj_node_id,
-                    "created",
-                    "creation"
-                )
-            
-            # Connect to owner if different from sender
-            owner = obj.get("owner")
-            if owner and owner != sender:
-                owner_node = f"addr_{owner}"
-                if owner.startswith("Object("):
-                    # Object-owned
-                    owner_id = owner[7:-1]
-                    owner_node = f"obj_{owner_id}"
-                    self._add_node(owner_node, truncate_address(owner_id), "object")
+        for change_kind, (prefix, edge_label, edge_type) in _OBJECT_SECTIONS.items():
+            for obj in object_changes.get(change_kind, []):
+                obj_id = obj["object_id"]
+                obj_node_id = f"obj_{obj_id}"
                 
-                self._add_edge(
-                    obj_node_id,
-                    owner_node,
-                    "owned by",
-                    "creation"
-                )
-        
-        # Mutated objects
-        for obj in object_changes.get("mutated", []):
-            obj_id = obj["object_id"]
-            obj_node_id = f"obj_{obj_id}"
-            
-            obj_type = obj["object_type"]
-            type_label = obj_type.split("::")[-1][:20]
-            
-            self._add_node(obj_node_id, f"Modified: {type_label}", "object")
-            
-            if sender:
-                self._add_edge(
-                    f"addr_{sender}",
-                    obj_node_id,
-                    "modified",
-                    "mutation"
-                )
-        
-        # Deleted objects
-        for obj in object_changes.get("deleted", []):
-            obj_id = obj["object_id"]
-            obj_node_id = f"obj_{obj_id}"
-            
-            obj_type = obj["object_type"]
-            type_label = obj_type.split("::")[-1][:20]
-            
-            self._add_node(obj_node_id, f"Deleted: {type_label}", "object")
-            
-            if sender:
-                self._add_edge(
-                    f"addr_{sender}",
-                    obj_node_id,
-                    "deleted",
-                    "deletion"
-                )
+                self._add_node(obj_node_id, prefix + _type_label(obj["object_type"]), "object")
+                
+                # Connect from sender
+                if sender:
+                    self._add_edge(
+                        sender_node,
+                        obj_node_id,
+                        edge_label,
+                        edge_type
+                    )
+                
+                if change_kind != "created":
+                    continue
+                
+                # Connect created objects to owner if different from sender
+                owner = obj.get("owner")
+                if owner and owner != sender:
+                    owner_node = f"addr_{owner}"
+                    if owner.startswith("Object("):
+                        # Object-owned
+                        owner_id = owner[7:-1]
+                        owner_node = f"obj_{owner_id}"
+                        self._add_node(owner_node, truncate_address(owner_id), "object")
+                    
+                    self._add_edge(
+                        obj_node_id,
+                        owner_node,
+                        "owned by",
+                        "creation"
+                    )
         
-        return DiagramData(nodes=self.nodes, edges=self.edges)
+        return DiagramData.model_construct(nodes=list(self.nodes.values()), edges=self.edges)
 
 
 def generate_diagram(transaction_data: Dict[str, Any], parsed_data: Dict[str, Any]) -> DiagramData:
@@ -1,16 +1,54 @@
 """
 Google Gemini API client for generating human-readable explanations.
 """
-import json
-from typing import Dict, Any
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, AsyncIterator, Iterable, List, Mapping, Optional, Set, Tuple
 import google.generativeai as genai
+import orjson
+from .cache import SingleFlight, analysis_cache
 from .config import config
 
+logger = logging.getLogger(__name__)
 
-from typing import Dict, Any
+# genai.configure mutates process-wide state, so only do it once
+_configured = False
+_configure_lock = threading.Lock()
 
 
-from typing import Dict, Any
+# Read-only defaults for missing sections in slim_transaction
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+_EMPTY_SEQ: Tuple[Any, ...] = ()
+
+
+def _slim_object_refs(refs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Project effects object references onto the fields the prompt asks for.
+    
+    Args:
+        refs: Owned (created/mutated) or plain (deleted) object references from effects
+        
+    Returns:
+        List of dicts with object_id, version, and (for owned refs) owner
+    """
+    slimmed = []
+    for ref in refs:
+        # Created/mutated entries nest the ref under "reference" next to the owner;
+        # deleted ones are the bare ref and never carried an owner
+        reference = ref.get("reference")
+        if reference is None:
+            slimmed.append({"object_id": ref.get("objectId"), "version": ref.get("version")})
+        else:
+            slimmed.append({
+                "object_id": reference.get("objectId"),
+                "owner": ref.get("owner"),
+                "version": reference.get("version"),
+            })
+    return slimmed
 
 
 def slim_transaction(tx: Dict[str, Any]) -> Dict[str, Any]:
@@ -19,42 +57,44 @@ def slim_transaction(tx: Dict[str, Any]) -> Dict[str, Any]:
     Preserves object lifecycle information required for analysis.
     """
 
-    transaction_data = tx.get("transaction", {}).get("data", {})
-    effects = tx.get("effects", {})
+    # Shared read-only defaults avoid allocating a fresh {} / [] per missing key
+    tx_get = tx.get
+    transaction_data = tx_get("transaction", _EMPTY).get("data", _EMPTY)
+    effects = tx_get("effects", _EMPTY)
+    effects_get = effects.get
+    gas_used = effects_get("gasUsed", _EMPTY)
 
     return {
         # Core identifiers
-        "digest": tx.get("digest"),
+        "digest": tx_get("digest"),
         "sender": transaction_data.get("sender"),
 
         # Move calls
         "transactions": (
             transaction_data
-            .get("transaction", {})
+            .get("transaction", _EMPTY)
             .get("transactions", [])
         ),
 
-        # ✅ CRITICAL: object lifecycle data
+        # ✅ CRITICAL: object lifecycle data, projected to the fields the prompt schema uses
         "effects": {
-            "created": effects.get("created", []),
-            "mutated": effects.get("mutated", []),
-            "deleted": effects.get("deleted", []),
+            "created": _slim_object_refs(effects_get("created", _EMPTY_SEQ)),
+            "mutated": _slim_object_refs(effects_get("mutated", _EMPTY_SEQ)),
+            "deleted": _slim_object_refs(effects_get("deleted", _EMPTY_SEQ)),
         },
 
         # Gas (summarized)
         "gas": {
-            "computationCost": effects.get("gasUsed", {}).get("computationCost"),
-            "storageCost": effects.get("gasUsed", {}).get("storageCost"),
-            "storageRebate": effects.get("gasUsed", {}).get("storageRebate"),
+            "computationCost": gas_used.get("computationCost"),
+            "storageCost": gas_used.get("storageCost"),
+            "storageRebate": gas_used.get("storageRebate"),
         },
 
         # Execution status
-        "status": effects.get("status"),
+        "status": effects_get("status"),
     }
 
 
-
-
 class GeminiClient:
     """Client for Google Gemini API."""
     
@@ -105,6 +145,17 @@ Do not repeat full hex addresses unless necessary.
 Now analyze this transaction:
 """
     
+    # Built once at class creation instead of on every request
+    _PROMPT_PREFIX = SYSTEM_PROMPT + "\n\n"
+    _BATCH_PROMPT_PREFIX = (
+        "You will receive a JSON array of Sui transactions. Produce the JSON object "
+        "described below for EACH transaction, add a \"digest\" field to it copied "
+        "exactly from that transaction's input \"digest\", and return ONLY a JSON "
+        "array of those objects.\n\n"
+        + SYSTEM_PROMPT.replace("Now analyze this transaction:", "Now analyze these transactions:")
+        + "\n\n"
+    )
+    
     def __init__(self, api_key: str = None):
         """
         Initialize Gemini client.
@@ -112,16 +163,31 @@ Now analyze this transaction:
         Args:
             api_key: Google Gemini API key
         """
+        global _configured
         self.api_key = api_key or config.GEMINI_API_KEY
         if not self.api_key:
             raise ValueError("Gemini API key is required")
         
-        genai.configure(api_key=self.api_key)
+        with _configure_lock:
+            if not _configured:
+                genai.configure(api_key=self.api_key)
+                _configured = True
+        
+        # Shared across all requests served by this client
         self.model = genai.GenerativeModel(config.GEMINI_MODEL)
+        self._inflight = SingleFlight()
+        self._batcher = GeminiBatcher(
+            self,
+            max_batch=config.GEMINI_BATCH_MAX_SIZE,
+            max_wait_ms=config.GEMINI_BATCH_MAX_WAIT_MS
+        ) if config.GEMINI_BATCH_ENABLED else None
     
-    async def analyze_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def analyze_or_wait(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Analyze transaction and return structured data.
+        Analyze transaction, reusing cached or in-flight analyses of identical data.
+        
+        Analyses are keyed by transaction digest, which identifies the
+        transaction's content, so no hashing of the (large) block is needed.
         
         Args:
             transaction_data: Raw transaction data from Sui RPC
@@ -129,62 +195,308 @@ Now analyze this transaction:
         Returns:
             Dictionary with summary, objects, packages, and diagram
         """
+        digest = transaction_data.get("digest")
+        # Hash the payload only for the rare block without a digest
+        key = digest or hashlib.sha256(orjson.dumps(transaction_data)).hexdigest()
+        
+        cached_analysis = analysis_cache.get(key)
+        if cached_analysis is not None:
+            return cached_analysis
+        
+        async def analyze_and_cache() -> Dict[str, Any]:
+            if self._batcher is not None:
+                analysis = await self._batcher.analyze(transaction_data)
+            else:
+                analysis = await self.analyze_transaction(transaction_data)
+            analysis_cache.set(key, analysis)
+            return analysis
+        
+        return await self._inflight.do(key, analyze_and_cache)
+    
+    def _build_prompt(self, transaction_data: Dict[str, Any]) -> str:
+        """
+        Build the Gemini prompt for a transaction.
+        
+        Args:
+            transaction_data: Raw transaction data from Sui RPC
+            
+        Returns:
+            System prompt followed by the slimmed transaction JSON
+        """
         # Slim down transaction to essential fields (saves tokens!)
-        print("Full transaction", transaction_data)
         slimmed_data = slim_transaction(transaction_data)
         
-        # Format slimmed data as compact JSON (no indentation to save tokens)
-        transaction_json = json.dumps(slimmed_data)
-        print("slimmed:", transaction_json)
+        # Format slimmed data as compact JSON (orjson never emits indentation or spaces)
+        transaction_json = orjson.dumps(slimmed_data).decode()
+        logger.debug("Slimmed transaction: %s", transaction_json)
         
-        # Construct prompt
-        prompt = f"{self.SYSTEM_PROMPT}\n\n{transaction_json}"
+        return self._PROMPT_PREFIX + transaction_json
+    
+    async def stream_transaction(self, transaction_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Stream Gemini's raw response text for a transaction as it is generated.
         
-        try:
-            # Generate response
-            response = self.model.generate_content(prompt)
-            
-            # Extract text from response
-            response_text = None
-            if hasattr(response, 'text'):
-                response_text = response.text.strip()
-            elif hasattr(response, 'candidates') and len(response.candidates) > 0:
-                response_text = response.candidates[0].content.parts[0].text.strip()
+        Args:
+            transaction_data: Raw transaction data from Sui RPC
             
-            if not response_text:
-                raise ValueError("No response text received from Gemini")
+        Yields:
+            Response text chunks, in order
+        """
+        prompt = self._build_prompt(transaction_data)
+        
+        # Generate response without blocking the event loop for the LLM round trip
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+    
+    async def analyze_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze transaction and return structured data.
+        
+        Args:
+            transaction_data: Raw transaction data from Sui RPC
             
-            # Remove markdown code blocks if present
-            response_text = response_text.strip()
-            if response_text.startswith('```'):
-                # Remove opening ```json or ```
-                lines = response_text.split('\n')
-                response_text = '\n'.join(lines[1:-1]) if len(lines) > 2 else response_text
-                response_text = response_text.strip()
+        Returns:
+            Dictionary with summary, objects, packages, and diagram
+        """
+        try:
+            chunks = [chunk async for chunk in self.stream_transaction(transaction_data)]
+            return parse_analysis("".join(chunks))
+        except Exception as e:
+            logger.error("Error in Gemini analysis: %s", e)
+            # Re-raise exception instead of returning error object
+            raise
+
+    
+    async def analyze_batch(self, transactions: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze several transactions with a single Gemini request.
+        
+        Results are matched to transactions by the digest Gemini echoes back,
+        never by position, so a reordered or merged reply cannot hand one
+        transaction another's analysis.
+        
+        Args:
+            transactions: Raw transaction data from Sui RPC, one per transaction
             
-            # Parse JSON response
-            parsed_response = json.loads(response_text)
-            print("Gemini analysis successful.", parsed_response)
+        Returns:
+            Analyses keyed by transaction digest; digests Gemini omitted,
+            repeated, or did not ask about are left out
             
-            return parsed_response
+        Raises:
+            ValueError: If Gemini does not return a JSON array
+        """
+        slimmed = [slim_transaction(tx) for tx in transactions]
+        prompt = self._BATCH_PROMPT_PREFIX + orjson.dumps(slimmed).decode()
         
-        except json.JSONDecodeError as e:
-            print(f"Failed to parse Gemini JSON response: {e}")
-            print(f"Response text: {response_text[:500] if response_text else 'None'}")
-            # Raise exception instead of returning error object
-            raise ValueError(f"Failed to parse Gemini response: {e}")
+        try:
+            response = await self.model.generate_content_async(prompt)
+            analyses = parse_analysis(response.text)
+            if not isinstance(analyses, list):
+                raise ValueError(
+                    f"Expected a JSON array from Gemini batch, got {type(analyses).__name__}"
+                )
         except Exception as e:
-            print(f"Error in Gemini analysis: {str(e)}")
-            # Re-raise exception instead of returning error object
+            logger.error("Error in Gemini batch analysis: %s", e)
             raise
+        
+        requested = {tx.get("digest") for tx in transactions}
+        results: Dict[str, Dict[str, Any]] = {}
+        duplicates = set()
+        for analysis in analyses:
+            if not isinstance(analysis, dict):
+                continue
+            digest = analysis.pop("digest", None)
+            if digest not in requested or digest is None:
+                continue
+            if digest in results:
+                duplicates.add(digest)
+            results[digest] = analysis
+        
+        # An ambiguous digest cannot be trusted for either entry
+        for digest in duplicates:
+            del results[digest]
+        return results
+
+
+class GeminiBatcher:
+    """
+    Group analyses that arrive close together into one Gemini request.
+    
+    Requests are queued; a background task collects up to max_batch of them,
+    waiting at most max_wait_ms after the first, and analyzes them together.
+    """
+    
+    def __init__(self, client: GeminiClient, max_batch: int = 8, max_wait_ms: int = 25):
+        """
+        Initialize batcher.
+        
+        Args:
+            client: Gemini client used to run batches
+            max_batch: Maximum transactions per Gemini request
+            max_wait_ms: Maximum time to hold the first request while filling a batch
+        """
+        self._client = client
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._drain_task: Optional[asyncio.Task] = None
+        # Strong references so running batches are not garbage collected
+        self._batch_tasks: Set[asyncio.Task] = set()
+    
+    async def analyze(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a transaction for batched analysis and wait for its result.
+        
+        Args:
+            transaction_data: Raw transaction data from Sui RPC
+            
+        Returns:
+            Dictionary with summary, objects, packages, and diagram
+        """
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain_loop())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((transaction_data, future))
+        return await future
+    
+    async def _drain_loop(self) -> None:
+        """Collect queued requests into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            
+            while len(batch) < self._max_batch:
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        batch.append(await self._queue.get())
+                except TimeoutError:
+                    break
+            
+            # Run the batch in the background so the next one can start filling
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """
+        Analyze one batch and resolve each caller's future.
+        
+        Args:
+            batch: Queued (transaction_data, future) pairs
+        """
+        if len(batch) == 1:
+            results = {}
+        else:
+            try:
+                results = await self._client.analyze_batch([tx for tx, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        
+        # Anything Gemini did not answer by digest is analyzed on its own
+        await asyncio.gather(*(
+            self._resolve(future, results.get(tx.get("digest")), tx)
+            for tx, future in batch
+        ))
+    
+    async def _resolve(
+        self,
+        future: asyncio.Future,
+        result: Optional[Dict[str, Any]],
+        transaction_data: Dict[str, Any]
+    ) -> None:
+        """
+        Resolve one caller's future, analyzing its transaction alone if needed.
+        
+        Args:
+            future: Future the caller is awaiting
+            result: Batch analysis matched by digest, or None
+            transaction_data: Raw transaction data from Sui RPC
+        """
+        if result is None:
+            try:
+                result = await self._client.analyze_transaction(transaction_data)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                return
+        
+        if not future.done():
+            future.set_result(result)
+
+
+def parse_analysis(response_text: str) -> Dict[str, Any]:
+    """
+    Parse Gemini's complete response text into the analysis dictionary.
+    
+    Args:
+        response_text: Full response text, optionally wrapped in a markdown code block
+        
+    Returns:
+        Dictionary with summary, objects, packages, and diagram
+        
+    Raises:
+        ValueError: If the response is empty or not valid JSON
+    """
+    response_text = response_text.strip()
+    if not response_text:
+        raise ValueError("No response text received from Gemini")
+    
+    # Remove markdown code blocks if present
+    if response_text.startswith('```'):
+        # Slice between the opening ```json line and the closing fence without splitting into lines
+        start = response_text.find('\n') + 1
+        end = response_text.rfind('```')
+        if 0 < start <= end:
+            response_text = response_text[start:end].strip()
+    
+    try:
+        return orjson.loads(response_text)
+    except orjson.JSONDecodeError as e:
+        logger.warning("Failed to parse Gemini JSON response: %s", e)
+        logger.debug("Response text: %s", response_text[:500])
+        # Raise exception instead of returning error object
+        raise ValueError(f"Failed to parse Gemini response: {e}")
+
+
+# The summary is the first field Gemini emits; match it once its closing quote arrives
+_SUMMARY_RE = re.compile(r'"summary"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def extract_summary(partial_text: str) -> Optional[str]:
+    """
+    Extract the summary from a possibly incomplete Gemini response.
+    
+    Args:
+        partial_text: Response text received so far
+        
+    Returns:
+        Decoded summary string, or None if it is not complete yet
+    """
+    match = _SUMMARY_RE.search(partial_text)
+    if match is None:
+        return None
+    try:
+        return orjson.loads(f'"{match.group(1)}"')
+    except orjson.JSONDecodeError:
+        return None
 
 
 # Global Gemini client instance
 gemini_client = None
+_client_lock = threading.Lock()
 
 def get_gemini_client() -> GeminiClient:
-    """Get or create Gemini client instance."""
+    """Get or create Gemini client instance (thread-safe)."""
     global gemini_client
     if gemini_client is None:
-        gemini_client = GeminiClient()
+        with _client_lock:
+            if gemini_client is None:
+                gemini_client = GeminiClient()
     return gemini_client
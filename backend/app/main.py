@@ -5,24 +5,42 @@ Main FastAPI application.
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, RedirectResponse, Response, StreamingResponse
+import asyncio
+import logging
 import os
 from pathlib import Path
+from typing import Any, NamedTuple
+
+import orjson
 
 from .config import config
-from .cache import transaction_cache
-from .sui_rpc import get_sui_rpc_client
+from .cache import SingleFlight, analysis_cache, transaction_cache
+from .sui_rpc import close_shared_client, get_sui_rpc_client
 from .parser import TransactionParser
-from .gemini_client import get_gemini_client
+from .gemini_client import get_gemini_client, parse_analysis, extract_summary
 from .diagram import generate_diagram
-from .schemas import AnalyzeRequest, AnalyzeResponse, ErrorResponse
+from .schemas import (
+    AnalyzeRequest, AnalyzeResponse, ErrorResponse,
+    DiagramData, ObjectChanges,
+    OBJECT_CHANGE_LIST_ADAPTER, PACKAGE_INFO_LIST_ADAPTER
+)
 
 
+# Configure logging once for the whole app; DEBUG output is skipped entirely at higher levels
+logging.basicConfig(
+    level=config.LOG_LEVEL.upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Suilyzer",
     description="Analyze Sui blockchain transactions in plain English",
-    version="1.0.0"
+    version="1.0.0",
+    # Serialize JSON responses (which embed the full raw transaction) with orjson
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -34,24 +52,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Validate configuration at module load time (fails fast)
-try:
-    config.validate()
-    print(f"✓ Suilyzer configuration validated")
-    print(f"✓ Using Sui RPC: {config.SUI_RPC_URL}")
-    print(f"✓ Using Gemini model: {config.GEMINI_MODEL}")
-except Exception as e:
-    print(f"✗ Configuration error: {e}")
-    raise
+# Configuration is validated when .config is imported (fails fast)
+logger.info("✓ Suilyzer configuration validated")
+logger.info("✓ Using Sui RPC: %s", config.SUI_RPC_URL)
+logger.info("✓ Using Gemini model: %s", config.GEMINI_MODEL)
+
+# Resolve the frontend once at startup instead of stat()ing it on every request
+frontend_path = Path(__file__).parent.parent.parent / "frontend"
+_INDEX_FILE = frontend_path / "index.html"
+_HAS_FRONTEND_INDEX = _INDEX_FILE.exists()
+
+# Fullnode RPC endpoint per supported network; also serves as the network allowlist
+_RPC_URLS = {
+    "testnet": "https://fullnode.testnet.sui.io:443",
+    "mainnet": "https://fullnode.mainnet.sui.io:443",
+}
+
+# One long-lived Sui RPC client per network; they share sui_rpc's lazily created
+# pooled HTTP client, so nothing here depends on the ASGI startup hook running
+_SUI_CLIENTS = {
+    network: get_sui_rpc_client(rpc_url)
+    for network, rpc_url in _RPC_URLS.items()
+}
+
+# In-flight /analyze work keyed by network:digest
+_INFLIGHT = SingleFlight()
+
+
+@app.on_event("shutdown")
+async def close_sui_clients():
+    """Close the pooled HTTP client used by the Sui RPC clients."""
+    await close_shared_client()
 
 
 @app.get("/")
 async def root():
     """Root endpoint - redirect to app or show API info."""
-    from fastapi.responses import RedirectResponse
-    # Check if frontend exists, redirect to /app, otherwise show API info
-    frontend_path = Path(__file__).parent.parent.parent / "frontend"
-    if (frontend_path / "index.html").exists():
+    # Redirect to /app if the frontend was found at startup, otherwise show API info
+    if _HAS_FRONTEND_INDEX:
         return RedirectResponse(url="/app")
     return {
         "name": "Suilyzer",
@@ -60,6 +98,7 @@ async def root():
         "endpoints": {
             "app": "GET /app - Frontend UI",
             "analyze": "POST /analyze - Analyze a transaction",
+            "analyze_stream": "POST /analyze/stream - Analyze a transaction, streamed as server-sent events",
             "health": "GET /health - Health check"
         }
     }
@@ -71,23 +110,25 @@ async def health_check():
     return {
         "status": "healthy",
         "cache_size": transaction_cache.size(),
+        "cache_hits": transaction_cache.hits,
+        "cache_misses": transaction_cache.misses,
         "sui_rpc": config.SUI_RPC_URL
     }
 
 
-@app.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_transaction(request: AnalyzeRequest):
+def _validate_request(request: AnalyzeRequest, include_raw: bool = False) -> tuple[str, str, str]:
     """
-    Analyze a Sui transaction and return human-readable explanation.
+    Normalize and validate an analyze request.
     
     Args:
-        request: AnalyzeRequest with transaction digest
+        request: AnalyzeRequest with transaction digest and network
+        include_raw: Whether the response will carry raw_data
         
     Returns:
-        AnalyzeResponse with summary, diagram, objects, and packages
+        Tuple of (digest, network, cache_key)
         
     Raises:
-        HTTPException: If transaction not found or analysis fails
+        HTTPException: If digest is empty or network is unsupported
     """
     digest = request.digest.strip()
     network = request.network.lower()
@@ -96,136 +137,358 @@ async def analyze_transaction(request: AnalyzeRequest):
         raise HTTPException(status_code=400, detail="Transaction digest is required")
     
     # Validate network
-    if network not in ['testnet', 'mainnet']:
+    if network not in _RPC_URLS:
         raise HTTPException(status_code=400, detail="Network must be 'testnet' or 'mainnet'")
     
-    # Cache key includes network to avoid mixing results
-    cache_key = f"{network}:{digest}"
+    # Cache key includes network to avoid mixing results, and whether raw_data is included
+    cache_key = f"{network}:{digest}:raw" if include_raw else f"{network}:{digest}"
+    return digest, network, cache_key
+
+
+async def _fetch_transaction(network: str, digest: str) -> dict:
+    """
+    Fetch a transaction block from the selected network.
     
-    # Check cache first
-    cached_result = transaction_cache.get(cache_key)
-    if cached_result:
-        print(f"✓ Cache hit for {network} transaction {digest[:8]}...")
-        return cached_result
+    Args:
+        network: testnet or mainnet
+        digest: Transaction digest
+        
+    Returns:
+        Raw transaction data from Sui RPC
+    """
+    # Reuse the network's long-lived client (keep-alive connections, no per-request handshake)
+    logger.info("→ Fetching %s transaction %s...", network, digest[:8])
+    sui_client = _SUI_CLIENTS[network]
+    return await sui_client.get_transaction_block(digest)
+
+
+async def _compute_local(transaction_data: dict) -> str:
+    """
+    Compute the parts of the response derived locally from raw data.
     
-    # Get RPC URL for selected network
-    rpc_url = f"https://fullnode.{network}.sui.io:443"
+    Kept as a coroutine so it can be gathered with the Gemini call; wrap the
+    body in asyncio.to_thread if parsing ever becomes heavy.
     
-    try:
-        # Fetch transaction from Sui RPC using context manager
-        print(f"→ Fetching {network} transaction {digest[:8]}...")
-        async with get_sui_rpc_client() as sui_client:
-            sui_client.rpc_url = rpc_url  # Override RPC URL for this request
-            transaction_data = await sui_client.get_transaction_block(digest)
+    Args:
+        transaction_data: Raw transaction data from Sui RPC
         
-        # Parse transaction with Gemini (handles everything)
-        print(f"→ Analyzing transaction with Gemini AI...")
-        gemini = get_gemini_client()
-        gemini_analysis = await gemini.analyze_transaction(transaction_data)
+    Returns:
+        Formatted gas used
+    """
+    return TransactionParser(transaction_data).get_gas_used()
+
+
+def _with_object_type(objects: list) -> list:
+    """
+    Copy Gemini object dicts, defaulting a missing or null object_type to "unknown".
+    
+    Args:
+        objects: Object dicts from Gemini's analysis
         
-        # Calculate gas used from raw data
-        parser = TransactionParser(transaction_data)
-        gas_used = parser.get_gas_used()
+    Returns:
+        New list of dicts safe to validate as ObjectChange
+    """
+    return [{**obj, "object_type": obj.get("object_type") or "unknown"} for obj in objects]
+
+
+def _build_response(
+    gemini_analysis: dict,
+    transaction_data: dict,
+    gas_used: str,
+    include_raw: bool = False
+) -> AnalyzeResponse:
+    """
+    Combine Gemini's analysis with locally computed data into the API response.
+    
+    Args:
+        gemini_analysis: Parsed analysis returned by Gemini
+        transaction_data: Raw transaction data from Sui RPC
+        gas_used: Formatted gas used from _compute_local
+        include_raw: Attach the raw transaction data (debugging only)
         
-        # Convert Gemini's analysis to our response format
-        from .schemas import DiagramData, ObjectChanges, ObjectChange, PackageInfo
+    Returns:
+        AnalyzeResponse ready to return and cache
+    """
+    # Convert Gemini's analysis to our response format
+    
+    # Build diagram
+    diagram_src = gemini_analysis.get("diagram") or {}
+    diagram = DiagramData(
+        nodes=diagram_src.get("nodes", []),
+        edges=diagram_src.get("edges", [])
+    )
+    
+    # Build objects with safe conversion
+    objects_data = gemini_analysis.get("objects", {})
+    logger.debug("Gemini objects data: %s", objects_data)
+    
+    try:
+        created_objects = OBJECT_CHANGE_LIST_ADAPTER.validate_python(_with_object_type(objects_data.get("created", [])))
+        mutated_objects = OBJECT_CHANGE_LIST_ADAPTER.validate_python(_with_object_type(objects_data.get("mutated", [])))
+        deleted_objects = OBJECT_CHANGE_LIST_ADAPTER.validate_python(_with_object_type(objects_data.get("deleted", [])))
         
-        # Build diagram
-        diagram = DiagramData(
-            nodes=[node for node in gemini_analysis.get("diagram", {}).get("nodes", [])],
-            edges=[edge for edge in gemini_analysis.get("diagram", {}).get("edges", [])]
+        objects = ObjectChanges(
+            created=created_objects,
+            mutated=mutated_objects,
+            deleted=deleted_objects
         )
-        
-        # Build objects with safe conversion
-        objects_data = gemini_analysis.get("objects", {})
-        print(f"DEBUG: Gemini objects data: {objects_data}")
-        
-        try:
-            created_objects = []
-            for obj in objects_data.get("created", []):
-                print(f"DEBUG: Processing created object: {obj}")
-                # Ensure object_type is not None
-                if "object_type" not in obj or obj["object_type"] is None:
-                    obj["object_type"] = "unknown"
-                created_objects.append(ObjectChange(**obj))
-            
-            mutated_objects = []
-            for obj in objects_data.get("mutated", []):
-                print(f"DEBUG: Processing mutated object: {obj}")
-                if "object_type" not in obj or obj["object_type"] is None:
-                    obj["object_type"] = "unknown"
-                mutated_objects.append(ObjectChange(**obj))
-            
-            deleted_objects = []
-            for obj in objects_data.get("deleted", []):
-                print(f"DEBUG: Processing deleted object: {obj}")
-                if "object_type" not in obj or obj["object_type"] is None:
-                    obj["object_type"] = "unknown"
-                deleted_objects.append(ObjectChange(**obj))
-            
-            objects = ObjectChanges(
-                created=created_objects,
-                mutated=mutated_objects,
-                deleted=deleted_objects
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Final objects count - Created: %d, Mutated: %d, Deleted: %d",
+                len(created_objects), len(mutated_objects), len(deleted_objects)
             )
-            print(f"DEBUG: Final objects count - Created: {len(created_objects)}, Mutated: {len(mutated_objects)}, Deleted: {len(deleted_objects)}")
-        except Exception as e:
-            print(f"Error parsing objects from Gemini: {e}")
-            print(f"Objects data: {objects_data}")
-            objects = ObjectChanges(created=[], mutated=[], deleted=[])
+    except Exception as e:
+        logger.warning("Error parsing objects from Gemini: %s", e)
+        logger.debug("Objects data: %s", objects_data)
+        objects = ObjectChanges(created=[], mutated=[], deleted=[])
+    
+    # Build packages
+    try:
+        packages = PACKAGE_INFO_LIST_ADAPTER.validate_python(gemini_analysis.get("packages", []))
+    except Exception as e:
+        logger.warning("Error parsing packages from Gemini: %s", e)
+        packages = []
+    
+    # Build response
+    response = AnalyzeResponse(
+        summary=gemini_analysis.get("summary", "No summary available"),
+        diagram=diagram,
+        objects=objects,
+        packages=packages,
+        gas_used=gas_used,
+        # The raw block can be hundreds of KB; only validate and serialize it on request
+        raw_data=transaction_data if include_raw else None
+    )
+    
+    return response
+
+
+def _error_to_http(error: Exception, digest: str) -> HTTPException:
+    """
+    Map an analysis failure to the HTTPException reported to the client.
+    
+    Args:
+        error: Exception raised while fetching or analyzing
+        digest: Transaction digest being analyzed
         
-        # Build packages
-        try:
-            packages = [PackageInfo(**pkg) for pkg in gemini_analysis.get("packages", [])]
-        except Exception as e:
-            print(f"Error parsing packages from Gemini: {e}")
-            packages = []
+    Returns:
+        HTTPException with an appropriate status code
+    """
+    error_message = str(error)
+    logger.error("✗ Error analyzing transaction: %s", error_message)
+    
+    if isinstance(error, TimeoutError):
+        return HTTPException(
+            status_code=504,
+            detail=f"Analysis timed out after {config.GEMINI_TIMEOUT_SECONDS} seconds. Please try again."
+        )
+    
+    # Don't cache errors - check for specific error types and raise appropriate HTTPException
+    if "not found" in error_message.lower() or "does not exist" in error_message.lower():
+        return HTTPException(
+            status_code=404,
+            detail=f"Transaction not found: {digest}"
+        )
+    elif "invalid" in error_message.lower():
+        return HTTPException(
+            status_code=400,
+            detail=f"Invalid transaction digest: {digest}"
+        )
+    elif "429" in error_message or "quota" in error_message.lower() or "rate limit" in error_message.lower():
+        # Rate limit errors - return 429 with retry info
+        return HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded. Please try again later. {error_message}"
+        )
+    else:
+        return HTTPException(
+            status_code=500,
+            detail=f"Error analyzing transaction: {error_message}"
+        )
+
+
+class _CachedResponse(NamedTuple):
+    """A cached analysis, serialized once so cache hits skip Pydantic entirely."""
+    
+    summary: str
+    body: bytes
+
+
+def _cache_response(cache_key: str, response: AnalyzeResponse) -> _CachedResponse:
+    """
+    Serialize a response and store it in the response cache.
+    
+    Args:
+        cache_key: Network-qualified cache key
+        response: Successful analysis response
         
-        # Build response
-        response = AnalyzeResponse(
-            summary=gemini_analysis.get("summary", "No summary available"),
-            diagram=diagram,
-            objects=objects,
-            packages=packages,
-            gas_used=gas_used,
-            raw_data=transaction_data
+    Returns:
+        The cached entry
+    """
+    cached = _CachedResponse(response.summary, orjson.dumps(response.model_dump(mode="json")))
+    transaction_cache.set(cache_key, cached)
+    return cached
+
+
+async def _analyze_uncached(
+    network: str,
+    digest: str,
+    cache_key: str,
+    include_raw: bool = False
+) -> _CachedResponse:
+    """
+    Fetch, analyze, and cache a transaction that missed the response cache.
+    
+    Args:
+        network: testnet or mainnet
+        digest: Transaction digest
+        cache_key: Network-qualified cache key
+        include_raw: Attach the raw transaction data to the response
+        
+    Returns:
+        Cached entry holding the serialized AnalyzeResponse
+    """
+    transaction_data = await _fetch_transaction(network, digest)
+    
+    # Parse transaction with Gemini (handles everything)
+    logger.info("→ Analyzing transaction with Gemini AI...")
+    gemini = get_gemini_client()
+    # Local parsing runs while the Gemini request is in flight; asyncio.timeout
+    # cancels in place rather than spawning an extra task like wait_for
+    async with asyncio.timeout(config.GEMINI_TIMEOUT_SECONDS):
+        gemini_analysis, gas_used = await asyncio.gather(
+            gemini.analyze_or_wait(transaction_data),
+            _compute_local(transaction_data)
         )
+    
+    response = _build_response(gemini_analysis, transaction_data, gas_used, include_raw)
+    
+    # Cache ONLY successful results (not errors) - use network-specific cache key
+    cached = _cache_response(cache_key, response)
+    logger.info("✓ %s transaction %s... analyzed and cached", network.capitalize(), digest[:8])
+    
+    return cached
+
+
+@app.post("/analyze", response_model=AnalyzeResponse)
+async def analyze_transaction(request: AnalyzeRequest, debug: bool = False):
+    """
+    Analyze a Sui transaction and return human-readable explanation.
+    
+    Args:
+        request: AnalyzeRequest with transaction digest
+        debug: Include raw_data in the response (always on when DEBUG is set)
         
-        # Cache ONLY successful results (not errors) - use network-specific cache key
-        transaction_cache.set(cache_key, response)
-        print(f"✓ {network.capitalize()} transaction {digest[:8]}... analyzed and cached")
+    Returns:
+        AnalyzeResponse with summary, diagram, objects, and packages
         
-        return response
+    Raises:
+        HTTPException: If transaction not found or analysis fails
+    """
+    include_raw = debug or config.DEBUG
+    digest, network, cache_key = _validate_request(request, include_raw)
+    
+    # Check cache first
+    cached_result = transaction_cache.get(cache_key)
+    if cached_result:
+        logger.info("✓ Cache hit for %s transaction %s...", network, digest[:8])
+        return Response(content=cached_result.body, media_type="application/json")
+    
+    try:
+        # Concurrent requests for the same digest share one RPC fetch and Gemini call
+        result = await _INFLIGHT.do(
+            cache_key,
+            lambda: _analyze_uncached(network, digest, cache_key, include_raw)
+        )
     
     except HTTPException:
         # Don't cache HTTP exceptions - re-raise immediately
         raise
     except Exception as e:
-        error_message = str(e)
-        print(f"✗ Error analyzing transaction: {error_message}")
+        raise _error_to_http(e, digest)
+    
+    # Same bytes that were cached; skips FastAPI's response_model re-validation
+    return Response(content=result.body, media_type="application/json")
+
+
+def _sse_event(event: str, data: Any) -> bytes:
+    """Encode one server-sent event with a JSON payload."""
+    return _sse_raw_event(event, orjson.dumps(data))
+
+
+def _sse_raw_event(event: str, payload: bytes) -> bytes:
+    """Encode one server-sent event whose payload is already serialized JSON."""
+    return b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
+
+
+@app.post("/analyze/stream")
+async def analyze_transaction_stream(request: AnalyzeRequest, debug: bool = False):
+    """
+    Analyze a Sui transaction, streaming progress as server-sent events.
+    
+    Emits a "summary" event as soon as Gemini has produced the complete
+    summary, then a "result" event with the full AnalyzeResponse. Failures
+    after the stream has started are reported as an "error" event.
+    
+    Args:
+        request: AnalyzeRequest with transaction digest
+        debug: Include raw_data in the result event (always on when DEBUG is set)
         
-        # Don't cache errors - check for specific error types and raise appropriate HTTPException
-        if "not found" in error_message.lower() or "does not exist" in error_message.lower():
-            raise HTTPException(
-                status_code=404,
-                detail=f"Transaction not found: {digest}"
-            )
-        elif "invalid" in error_message.lower():
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid transaction digest: {digest}"
-            )
-        elif "429" in error_message or "quota" in error_message.lower() or "rate limit" in error_message.lower():
-            # Rate limit errors - return 429 with retry info
-            raise HTTPException(
-                status_code=429,
-                detail=f"Rate limit exceeded. Please try again later. {error_message}"
-            )
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error analyzing transaction: {error_message}"
+    Returns:
+        StreamingResponse of text/event-stream events
+        
+    Raises:
+        HTTPException: If the request is invalid
+    """
+    include_raw = debug or config.DEBUG
+    digest, network, cache_key = _validate_request(request, include_raw)
+    
+    async def events():
+        cached_result = transaction_cache.get(cache_key)
+        if cached_result:
+            yield _sse_event("summary", cached_result.summary)
+            yield _sse_raw_event("result", cached_result.body)
+            return
+        
+        try:
+            transaction_data = await _fetch_transaction(network, digest)
+            
+            gas_used = await _compute_local(transaction_data)
+            
+            gemini = get_gemini_client()
+            chunks = []
+            summary_sent = False
+            # Only the awaits on Gemini sit inside the timeout; yielding from within a
+            # timeout scope would let the deadline fire inside Starlette's send()
+            deadline = asyncio.get_running_loop().time() + config.GEMINI_TIMEOUT_SECONDS
+            stream = gemini.stream_transaction(transaction_data)
+            try:
+                while True:
+                    try:
+                        async with asyncio.timeout_at(deadline):
+                            chunk = await anext(stream)
+                    except StopAsyncIteration:
+                        break
+                    chunks.append(chunk)
+                    if not summary_sent:
+                        summary = extract_summary("".join(chunks))
+                        if summary is not None:
+                            summary_sent = True
+                            yield _sse_event("summary", summary)
+            finally:
+                await stream.aclose()
+            
+            response = _build_response(
+                parse_analysis("".join(chunks)), transaction_data, gas_used, include_raw
             )
+            cached = _cache_response(cache_key, response)
+            yield _sse_raw_event("result", cached.body)
+        
+        except Exception as e:
+            error = _error_to_http(e, digest)
+            yield _sse_event("error", {"status": error.status_code, "detail": error.detail})
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 @app.delete("/cache/{digest}")
@@ -239,7 +502,11 @@ async def clear_cache_entry(digest: str):
     Returns:
         Success message
     """
-    transaction_cache.delete(digest)
+    # Responses are keyed per network (and raw_data variant); analyses by bare digest
+    for network in _RPC_URLS:
+        transaction_cache.delete(f"{network}:{digest}")
+        transaction_cache.delete(f"{network}:{digest}:raw")
+    analysis_cache.delete(digest)
     return {"message": f"Cache cleared for {digest}"}
 
 
@@ -251,14 +518,14 @@ async def clear_all_cache():
     Returns:
         Success message with count
     """
-    size = transaction_cache.size()
+    # Also drop cached Gemini analyses, or the next miss would reuse a stale one
+    size = transaction_cache.size() + analysis_cache.size()
     transaction_cache.clear()
+    analysis_cache.clear()
     return {"message": f"Cleared {size} cached transactions"}
 
 
 # Serve frontend static files
-frontend_path = Path(__file__).parent.parent.parent / "frontend"
-
 if frontend_path.exists():
     # Mount static files first (needs to be before catch-all route)
     app.mount("/static", StaticFiles(directory=str(frontend_path)), name="static")
@@ -266,9 +533,8 @@ if frontend_path.exists():
     @app.get("/app")
     async def serve_app():
         """Serve the frontend HTML at /app route."""
-        index_path = frontend_path / "index.html"
-        if index_path.exists():
-            return FileResponse(index_path)
+        if _HAS_FRONTEND_INDEX:
+            return FileResponse(_INDEX_FILE)
         raise HTTPException(status_code=404, detail="Frontend not found")
 
 
@@ -1,11 +1,51 @@
 """
 Parser for Sui transaction data.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from .utils import safe_get, format_sui_amount, extract_object_type
 from .schemas import ObjectChange, ObjectChanges, PackageInfo
 
 
+def _address_owner(owner_data: Any) -> Optional[str]:
+    """
+    Get the owning address if an owner value is address-owned.
+    
+    Args:
+        owner_data: Owner from RPC data
+        
+    Returns:
+        Owner address or None
+    """
+    if isinstance(owner_data, dict):
+        return owner_data.get("AddressOwner")
+    return None
+
+
+def _normalize_owner(owner_data: Any) -> Optional[str]:
+    """
+    Convert a Sui owner value to a display string.
+    
+    Args:
+        owner_data: Owner from RPC data, either a dict like {"AddressOwner": ...} or a string
+        
+    Returns:
+        Owner address, "Object(<id>)", "Shared", the raw string, or None
+    """
+    if isinstance(owner_data, dict):
+        # Single .get per key instead of an `in` test plus an index
+        address = owner_data.get("AddressOwner")
+        if address is not None:
+            return address
+        object_owner = owner_data.get("ObjectOwner")
+        if object_owner is not None:
+            return f"Object({object_owner})"
+        if "Shared" in owner_data:
+            return "Shared"
+    elif isinstance(owner_data, str):
+        return owner_data
+    return None
+
+
 class TransactionParser:
     """Parser for Sui transaction data."""
     
@@ -22,6 +62,12 @@ class TransactionParser:
         self.balance_changes = safe_get(transaction_data, "balanceChanges", default=[])
         self.events = safe_get(transaction_data, "events", default=[])
         self.transaction = safe_get(transaction_data, "transaction", default={})
+        # Parsed results, computed on first use
+        self._object_changes_cache: Optional[ObjectChanges] = None
+        self._object_change_dicts: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._packages_cache: Optional[List[PackageInfo]] = None
+        self._gas_used_cache: Optional[str] = None
+        self._balances_scanned: Optional[Tuple[List[str], List[Dict[str, Any]]]] = None
     
     def get_gas_used(self) -> str:
         """
@@ -30,23 +76,17 @@ class TransactionParser:
         Returns:
             Formatted gas string like "0.005 SUI"
         """
-        gas_used = safe_get(
-            self.effects, 
-            "gasUsed", 
-            "computationCost", 
-            default=0
-        )
+        if self._gas_used_cache is not None:
+            return self._gas_used_cache
         
-        if not gas_used:
-            # Try alternative path
-            gas_object = safe_get(self.effects, "gasUsed", default={})
-            if isinstance(gas_object, dict):
-                computation_cost = int(gas_object.get("computationCost", 0))
-                storage_cost = int(gas_object.get("storageCost", 0))
-                storage_rebate = int(gas_object.get("storageRebate", 0))
-                gas_used = computation_cost + storage_cost - storage_rebate
+        # Sui always reports gasUsed as a dict of string amounts
+        gas_object = self.effects.get("gasUsed") or {}
+        computation_cost = int(gas_object.get("computationCost", 0) or 0)
+        storage_cost = int(gas_object.get("storageCost", 0) or 0)
+        storage_rebate = int(gas_object.get("storageRebate", 0) or 0)
         
-        return format_sui_amount(int(gas_used))
+        self._gas_used_cache = format_sui_amount(computation_cost + storage_cost - storage_rebate)
+        return self._gas_used_cache
     
     def get_object_changes(self) -> ObjectChanges:
         """
@@ -55,64 +95,71 @@ class TransactionParser:
         Returns:
             ObjectChanges with categorized object changes
         """
+        if self._object_changes_cache is not None:
+            return self._object_changes_cache
+        
+        buckets = self._categorize_object_changes()
+        # Fields are already normalized from our own RPC data, so skip validation
+        construct = ObjectChange.model_construct
+        self._object_changes_cache = ObjectChanges.model_construct(
+            created=[construct(**obj) for obj in buckets["created"]],
+            mutated=[construct(**obj) for obj in buckets["mutated"]],
+            deleted=[construct(**obj) for obj in buckets["deleted"]]
+        )
+        return self._object_changes_cache
+    
+    def _categorize_object_changes(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Normalize object changes into plain dicts, bucketed by change kind.
+        
+        Returns:
+            Dictionary of created, mutated, and deleted ObjectChange field dicts
+        """
+        if self._object_change_dicts is not None:
+            return self._object_change_dicts
+        
         created = []
         mutated = []
         deleted = []
         
+        # One hash lookup per change instead of walking an if/elif chain
+        dispatch = {
+            "created": created.append,
+            "mutated": mutated.append,
+            "deleted": deleted.append,
+            # Wrapped objects are similar to deleted
+            "wrapped": deleted.append,
+            # Published packages as created
+            "published": created.append,
+        }
+        
         for change in self.object_changes:
-            change_type = change.get("type")
-            
-            if change_type == "created":
-                created.append(self._parse_object_change(change))
-            elif change_type == "mutated":
-                mutated.append(self._parse_object_change(change))
-            elif change_type == "deleted":
-                deleted.append(self._parse_object_change(change))
-            elif change_type == "wrapped":
-                # Wrapped objects are similar to deleted
-                deleted.append(self._parse_object_change(change))
-            elif change_type == "published":
-                # Published packages as created
-                created.append(self._parse_object_change(change))
-        
-        return ObjectChanges(created=created, mutated=mutated, deleted=deleted)
+            append = dispatch.get(change.get("type"))
+            if append is not None:
+                append(self._normalize_object_change(change))
+        
+        self._object_change_dicts = {"created": created, "mutated": mutated, "deleted": deleted}
+        return self._object_change_dicts
     
-    def _parse_object_change(self, change: Dict[str, Any]) -> ObjectChange:
+    @staticmethod
+    def _normalize_object_change(change: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Parse a single object change.
+        Flatten a single object change into ObjectChange fields.
         
         Args:
             change: Object change data
             
         Returns:
-            ObjectChange instance
-        """
-        object_id = change.get("objectId", "unknown")
-        object_type = change.get("objectType", "unknown")
-        
-        owner = None
-        if "owner" in change:
-            owner_data = change["owner"]
-            if isinstance(owner_data, dict):
-                if "AddressOwner" in owner_data:
-                    owner = owner_data["AddressOwner"]
-                elif "ObjectOwner" in owner_data:
-                    owner = f"Object({owner_data['ObjectOwner']})"
-                elif "Shared" in owner_data:
-                    owner = "Shared"
-            elif isinstance(owner_data, str):
-                owner = owner_data
-        
-        digest = change.get("digest")
+            Dictionary of ObjectChange fields
+        """
         version = change.get("version")
-        
-        return ObjectChange(
-            object_id=object_id,
-            object_type=object_type,
-            owner=owner,
-            digest=digest,
-            version=str(version) if version else None
-        )
+        return {
+            "object_id": change.get("objectId", "unknown"),
+            "object_type": change.get("objectType", "unknown"),
+            "owner": _normalize_owner(change.get("owner")),
+            "digest": change.get("digest"),
+            "version": str(version) if version is not None else None,
+        }
     
     def get_packages(self) -> List[PackageInfo]:
         """
@@ -121,6 +168,9 @@ class TransactionParser:
         Returns:
             List of PackageInfo
         """
+        if self._packages_cache is not None:
+            return self._packages_cache
+        
         packages = []
         
         # Get from transaction data
@@ -137,7 +187,7 @@ class TransactionParser:
                 function = move_call.get("function")
                 
                 if package_id:
-                    packages.append(PackageInfo(
+                    packages.append(PackageInfo.model_construct(
                         package_id=package_id,
                         module=module,
                         function=function
@@ -148,12 +198,13 @@ class TransactionParser:
             if change.get("type") == "published":
                 package_id = change.get("packageId", change.get("objectId"))
                 if package_id:
-                    packages.append(PackageInfo(
+                    packages.append(PackageInfo.model_construct(
                         package_id=package_id,
                         module=None,
                         function=None
                     ))
         
+        self._packages_cache = packages
         return packages
     
     def get_sender(self) -> Optional[str]:
@@ -165,49 +216,55 @@ class TransactionParser:
         """
         return safe_get(self.transaction, "data", "sender")
     
-    def get_recipients(self) -> List[str]:
+    def _scan_balances(self) -> Tuple[List[str], List[Dict[str, Any]]]:
         """
-        Get recipient addresses from balance changes.
+        Collect recipients and coin transfers in a single pass over balance changes.
         
         Returns:
-            List of recipient addresses
+            Tuple of (recipient addresses, transfer dictionaries)
         """
-        recipients = set()
-        
-        for balance_change in self.balance_changes:
-            owner = balance_change.get("owner")
-            if isinstance(owner, dict) and "AddressOwner" in owner:
-                recipients.add(owner["AddressOwner"])
-        
-        return list(recipients)
-    
-    def get_coin_transfers(self) -> List[Dict[str, Any]]:
-        """
-        Extract coin transfer information.
+        if self._balances_scanned is not None:
+            return self._balances_scanned
         
-        Returns:
-            List of transfer dictionaries
-        """
+        recipients = set()
         transfers = []
         
         for balance_change in self.balance_changes:
-            amount = balance_change.get("amount")
-            coin_type = balance_change.get("coinType", "0x2::sui::SUI")
+            owner = _address_owner(balance_change.get("owner"))
+            if owner is None:
+                continue
             
-            owner = None
-            owner_data = balance_change.get("owner", {})
-            if isinstance(owner_data, dict) and "AddressOwner" in owner_data:
-                owner = owner_data["AddressOwner"]
+            recipients.add(owner)
             
+            amount = balance_change.get("amount")
             if owner and amount:
                 transfers.append({
                     "address": owner,
                     "amount": amount,
-                    "coin_type": coin_type,
+                    "coin_type": balance_change.get("coinType", "0x2::sui::SUI"),
                     "formatted_amount": format_sui_amount(abs(int(amount)))
                 })
         
-        return transfers
+        self._balances_scanned = (list(recipients), transfers)
+        return self._balances_scanned
+    
+    def get_recipients(self) -> List[str]:
+        """
+        Get recipient addresses from balance changes.
+        
+        Returns:
+            List of recipient addresses
+        """
+        return self._scan_balances()[0]
+    
+    def get_coin_transfers(self) -> List[Dict[str, Any]]:
+        """
+        Extract coin transfer information.
+        
+        Returns:
+            List of transfer dictionaries
+        """
+        return self._scan_balances()[1]
     
     def to_structured_data(self) -> Dict[str, Any]:
         """
@@ -216,16 +273,19 @@ class TransactionParser:
         Returns:
             Dictionary with all parsed transaction data
         """
+        # Plain dicts straight from normalization; no model build + dump round trip
+        object_changes = self._categorize_object_changes()
+        recipients, coin_transfers = self._scan_balances()
         return {
             "sender": self.get_sender(),
-            "recipients": self.get_recipients(),
+            "recipients": recipients,
             "gas_used": self.get_gas_used(),
             "object_changes": {
-                "created": [obj.model_dump() for obj in self.get_object_changes().created],
-                "mutated": [obj.model_dump() for obj in self.get_object_changes().mutated],
-                "deleted": [obj.model_dump() for obj in self.get_object_changes().deleted],
+                "created": list(object_changes["created"]),
+                "mutated": list(object_changes["mutated"]),
+                "deleted": list(object_changes["deleted"]),
             },
             "packages": [pkg.model_dump() for pkg in self.get_packages()],
-            "coin_transfers": self.get_coin_transfers(),
+            "coin_transfers": coin_transfers,
             "events_count": len(self.events),
         }
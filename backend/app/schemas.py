@@ -2,7 +2,7 @@
 Pydantic models for request/response validation.
 """
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class AnalyzeRequest(BaseModel):
@@ -16,6 +16,8 @@ class DiagramNode(BaseModel):
     id: str = Field(..., description="Unique node identifier")
     label: str = Field(..., description="Display label for the node")
     type: str = Field(..., description="Node type: address, object, or package")
+    
+    model_config = {"frozen": True, "extra": "ignore"}
 
 
 class DiagramEdge(BaseModel):
@@ -24,6 +26,8 @@ class DiagramEdge(BaseModel):
     target: str = Field(..., description="Target node ID")
     label: str = Field(..., description="Edge label describing the relationship")
     type: str = Field(..., description="Edge type: transfer, mutation, creation, deletion")
+    
+    model_config = {"frozen": True, "extra": "ignore"}
 
 
 class DiagramData(BaseModel):
@@ -40,14 +44,8 @@ class ObjectChange(BaseModel):
     digest: Optional[str] = Field(None, description="Object digest")
     version: Optional[str] = Field(None, description="Object version")
     
-    model_config = {"coerce_numbers_to_str": True}
-    
-    @classmethod
-    def model_validate(cls, obj):
-        # Convert version to string if it's a number
-        if isinstance(obj, dict) and "version" in obj and obj["version"] is not None:
-            obj["version"] = str(obj["version"])
-        return super().model_validate(obj)
+    # Numeric versions from Gemini output are accepted as strings; unknown keys are dropped
+    model_config = {"coerce_numbers_to_str": True, "extra": "ignore", "frozen": True}
 
 
 class ObjectChanges(BaseModel):
@@ -62,6 +60,13 @@ class PackageInfo(BaseModel):
     package_id: str = Field(..., description="Package ID")
     module: Optional[str] = Field(None, description="Module name")
     function: Optional[str] = Field(None, description="Function name")
+    
+    model_config = {"frozen": True, "extra": "ignore"}
+
+
+# Built once so whole lists are validated in a single pydantic-core call
+OBJECT_CHANGE_LIST_ADAPTER = TypeAdapter(List[ObjectChange])
+PACKAGE_INFO_LIST_ADAPTER = TypeAdapter(List[PackageInfo])
 
 
 class AnalyzeResponse(BaseModel):
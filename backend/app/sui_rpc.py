@@ -1,41 +1,122 @@
 """
 Sui RPC client for fetching transaction data.
 """
+import asyncio
+import importlib.util
 import httpx
-from typing import Dict, Any, Optional
+import orjson
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from .cache import Cache, SingleFlight
 from .config import config
 
+# One pooled HTTP client shared by every SuiRPCClient, so requests reuse
+# warm keep-alive connections instead of paying a TCP+TLS handshake each time
+_SHARED_CLIENT: Optional[httpx.AsyncClient] = None
+
+# httpx needs the optional h2 package for HTTP/2; fall back to HTTP/1.1 without it
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Caps in-flight RPC calls across all clients so large fan-outs queue here
+# instead of getting throttled by the public fullnode
+_RPC_SEMAPHORE = asyncio.Semaphore(config.SUI_RPC_MAX_CONCURRENCY)
+
+# Object IDs per sui_multiGetObjects request; larger lookups are split and sent concurrently
+_MULTI_GET_CHUNK = 50
+
+# Small cache of raw transaction blocks. The response cache in main.py already
+# serves repeat /analyze calls; this layer only covers requests that miss it for
+# the same digest: retries after a Gemini failure or timeout (errors are not
+# cached), and the raw_data/debug variant of a response. Blocks can be hundreds
+# of KB and the app may run as a serverless function, so keep it small and no
+# longer-lived than the response cache. Objects get new versions, so their
+# entries expire after an hour.
+_transaction_cache = Cache(ttl_seconds=config.CACHE_TTL_SECONDS, maxsize=64)
+_object_cache = Cache(ttl_seconds=3600, maxsize=1024)
+# Concurrent lookups for the same uncached key share one RPC call
+_inflight = SingleFlight()
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _method_header(method: str) -> bytes:
+    """Encode the constant part of a JSON-RPC request, up to the params value."""
+    return orjson.dumps({"jsonrpc": "2.0", "id": 1, "method": method})[:-1] + b',"params":'
+
+
+# Pre-encoded envelopes for the methods this client calls
+_METHOD_HEADERS = {
+    method: _method_header(method)
+    for method in ("sui_getTransactionBlock", "sui_getObject", "sui_multiGetObjects")
+}
+
+# Transaction fields requested by get_transaction_block
+_TX_OPTIONS = {
+    "showInput": True,
+    "showRawInput": False,
+    "showEffects": True,
+    "showEvents": True,
+    "showObjectChanges": True,
+    "showBalanceChanges": True
+}
+
+# Object fields requested by get_object and get_objects
+_OBJECT_OPTIONS = {
+    "showType": True,
+    "showOwner": True,
+    "showPreviousTransaction": True,
+    "showStorageRebate": True,
+    "showContent": True
+}
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None or _SHARED_CLIENT.is_closed:
+        # HTTP/2 multiplexes concurrent RPC calls over one connection per fullnode
+        _SHARED_CLIENT = httpx.AsyncClient(
+            timeout=30.0,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _SHARED_CLIENT
+
+
+async def close_shared_client() -> None:
+    """Close the shared HTTP client; call on application shutdown."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is not None:
+        await _SHARED_CLIENT.aclose()
+        _SHARED_CLIENT = None
+
 
 class SuiRPCClient:
     """Client for interacting with Sui RPC endpoint."""
     
-    def __init__(self, rpc_url: Optional[str] = None):
+    def __init__(self, rpc_url: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize Sui RPC client.
         
         Args:
             rpc_url: Sui RPC endpoint URL
+            client: HTTP client to use instead of the module-wide shared one
         """
         self.rpc_url = rpc_url or config.SUI_RPC_URL
-        self._client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[httpx.AsyncClient] = client
     
     async def __aenter__(self):
-        """Async context manager entry - create client."""
-        self._client = httpx.AsyncClient(timeout=30.0)
+        """Async context manager entry; kept for compatibility, the client is shared."""
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit - cleanup client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Async context manager exit; the shared client outlives this instance."""
+        return None
     
     @property
     def client(self) -> httpx.AsyncClient:
-        """Get HTTP client, ensuring it exists."""
-        if self._client is None:
-            raise RuntimeError("SuiRPCClient must be used as async context manager")
-        return self._client
+        """Get the HTTP client, falling back to the shared pooled client."""
+        return self._client or get_shared_client()
     
     async def _rpc_call(self, method: str, params: list) -> Dict[str, Any]:
         """
@@ -51,17 +132,20 @@ class SuiRPCClient:
         Raises:
             Exception: If RPC call fails
         """
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": method,
-            "params": params
-        }
-        
-        response = await self.client.post(self.rpc_url, json=payload)
+        # Only params vary per call; splice them into the pre-encoded envelope
+        header = _METHOD_HEADERS.get(method) or _method_header(method)
+        body = header + orjson.dumps(params) + b"}"
+        
+        async with _RPC_SEMAPHORE:
+            response = await self.client.post(
+                self.rpc_url,
+                content=body,
+                headers=_JSON_HEADERS
+            )
         response.raise_for_status()
         
-        data = response.json()
+        # Transaction blocks can be hundreds of KB; orjson decodes them much faster than stdlib json
+        data = orjson.loads(response.content)
         
         if "error" in data:
             error_msg = data["error"].get("message", "Unknown RPC error")
@@ -85,19 +169,17 @@ class SuiRPCClient:
         Raises:
             Exception: If transaction not found or RPC call fails
         """
-        params = [
-            digest,
-            {
-                "showInput": True,
-                "showRawInput": False,
-                "showEffects": True,
-                "showEvents": True,
-                "showObjectChanges": True,
-                "showBalanceChanges": True
-            }
-        ]
+        cache_key = f"{self.rpc_url}:{digest}"
+        cached = _transaction_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        async def fetch() -> Dict[str, Any]:
+            result = await self._rpc_call("sui_getTransactionBlock", [digest, _TX_OPTIONS])
+            _transaction_cache.set(cache_key, result)
+            return result
         
-        return await self._rpc_call("sui_getTransactionBlock", params)
+        return await _inflight.do(f"tx:{cache_key}", fetch)
     
     async def get_object(self, object_id: str) -> Dict[str, Any]:
         """
@@ -109,20 +191,54 @@ class SuiRPCClient:
         Returns:
             Object data
         """
-        params = [
-            object_id,
-            {
-                "showType": True,
-                "showOwner": True,
-                "showPreviousTransaction": True,
-                "showStorageRebate": True,
-                "showContent": True
-            }
-        ]
+        cache_key = f"{self.rpc_url}:{object_id}"
+        cached = _object_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        async def fetch() -> Dict[str, Any]:
+            result = await self._rpc_call("sui_getObject", [object_id, _OBJECT_OPTIONS])
+            _object_cache.set(cache_key, result)
+            return result
+        
+        return await _inflight.do(f"obj:{cache_key}", fetch)
+    
+    async def get_objects(self, object_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch details for several objects in as few round trips as possible.
+        
+        Args:
+            object_ids: Object IDs
+            
+        Returns:
+            Object data for each ID, in input order
+        """
+        if not object_ids:
+            return []
         
-        return await self._rpc_call("sui_getObject", params)
+        chunks = [
+            object_ids[i:i + _MULTI_GET_CHUNK]
+            for i in range(0, len(object_ids), _MULTI_GET_CHUNK)
+        ]
+        results = await asyncio.gather(*(
+            self._rpc_call("sui_multiGetObjects", [chunk, _OBJECT_OPTIONS])
+            for chunk in chunks
+        ))
+        return [obj for chunk_result in results for obj in chunk_result]
 
 
-def get_sui_rpc_client() -> SuiRPCClient:
-    """Factory function to create new RPC client instance."""
-    return SuiRPCClient()
+@lru_cache(maxsize=None)
+def get_sui_rpc_client(rpc_url: Optional[str] = None) -> SuiRPCClient:
+    """
+    Get the RPC client for an endpoint, creating it on first use.
+    
+    Clients hold no connection state of their own (they share one pooled
+    HTTP client), so a single instance per URL is safe to reuse.
+    
+    Args:
+        rpc_url: Sui RPC endpoint URL; defaults to config.SUI_RPC_URL
+        
+    Returns:
+        SuiRPCClient bound to rpc_url
+    """
+    return SuiRPCClient(rpc_url)
@@ -1,7 +1,8 @@
 """
 Utility functions for the Suilyzer backend.
 """
-from typing import Optional, Any
+from functools import lru_cache
+from typing import Optional, Any, NamedTuple
 
 
 def format_sui_amount(amount: int) -> str:
@@ -14,8 +15,12 @@ def format_sui_amount(amount: int) -> str:
     Returns:
         Formatted string like "0.05 SUI"
     """
-    sui_amount = amount / 1_000_000_000
-    return f"{sui_amount:.9f}".rstrip('0').rstrip('.') + " SUI"
+    # Integer math keeps full precision; floats drift past ~15 significant digits
+    sign = "-" if amount < 0 else ""
+    whole, frac = divmod(abs(amount), 1_000_000_000)
+    if frac == 0:
+        return f"{sign}{whole} SUI"
+    return f"{sign}{whole}.{frac:09d}".rstrip('0') + " SUI"
 
 
 def safe_get(data: dict, *keys: str, default: Any = None) -> Any:
@@ -30,14 +35,17 @@ def safe_get(data: dict, *keys: str, default: Any = None) -> Any:
     Returns:
         Value at nested key path or default
     """
+    # EAFP: most lookups succeed, so skip per-key isinstance/membership checks
     current = data
-    for key in keys:
-        if not isinstance(current, dict) or key not in current:
-            return default
-        current = current[key]
+    try:
+        for key in keys:
+            current = current[key]
+    except (KeyError, TypeError, IndexError):
+        return default
     return current
 
 
+@lru_cache(maxsize=4096)
 def truncate_address(address: str, start_chars: int = 6, end_chars: int = 4) -> str:
     """
     Truncate blockchain address for display.
@@ -50,52 +58,63 @@ def truncate_address(address: str, start_chars: int = 6, end_chars: int = 4) ->
     Returns:
         Truncated address like "0x1234...5678"
     """
-    if len(address) <= start_chars + end_chars + 3:
-        return address
-    return f"{address[:start_chars]}...{address[-end_chars:]}"
+    # Full 66-char Sui addresses always take the first arm; the length guard
+    # stays because short IDs like the "0x2" framework package also land here
+    return (
+        f"{address[:start_chars]}...{address[-end_chars:]}"
+        if len(address) > start_chars + end_chars + 3
+        else address
+    )
+
 
+class ObjectType(NamedTuple):
+    """Components of a Sui object type string."""
+    package: Optional[str]
+    module: Optional[str]
+    struct: Optional[str]
+    type_args: Optional[str]
+    full: str
 
-def extract_object_type(object_type: str) -> dict:
+
+@lru_cache(maxsize=4096)
+def extract_object_type(object_type: str) -> ObjectType:
     """
     Parse a Sui object type string into components.
     
+    Results are memoized and immutable, since the same type strings
+    repeat heavily within a transaction.
+    
     Args:
         object_type: Full object type like "0x2::coin::Coin<0x2::sui::SUI>"
         
     Returns:
-        Dictionary with package, module, struct, and type_args
+        ObjectType with package, module, struct, and type_args
     """
-    result = {
-        "package": None,
-        "module": None,
-        "struct": None,
-        "type_args": None,
-        "full": object_type
-    }
+    package = module = struct = type_args = None
     
     try:
-        # Split on < to separate base type from type arguments
-        if '<' in object_type:
-            base_type, type_args = object_type.split('<', 1)
-            result["type_args"] = type_args.rstrip('>')
-        else:
-            base_type = object_type
+        # partition never builds intermediate lists, unlike split/join
+        base_type, sep, args = object_type.partition('<')
+        if sep:
+            # Drop only the closing '>' that matches the first '<'
+            type_args = args[:-1] if args.endswith('>') else args
         
         # Split base type into package::module::struct
-        parts = base_type.split('::')
-        if len(parts) >= 3:
-            result["package"] = parts[0]
-            result["module"] = parts[1]
-            result["struct"] = '::'.join(parts[2:])
-        elif len(parts) == 2:
-            result["module"] = parts[0]
-            result["struct"] = parts[1]
+        first, sep1, rest = base_type.partition('::')
+        second, sep2, tail = rest.partition('::')
+        if sep2:
+            package, module, struct = first, second, tail
+        elif sep1:
+            module, struct = first, second
         else:
-            result["struct"] = base_type
+            struct = base_type
     except Exception:
         pass
     
-    return result
+    return ObjectType(package, module, struct, type_args, object_type)
+
+
+_SUI_COIN = "0x2::coin::Coin<0x2::sui::SUI>"
 
 
 def is_sui_coin(object_type: str) -> bool:
@@ -108,7 +127,7 @@ def is_sui_coin(object_type: str) -> bool:
     Returns:
         True if this is a SUI coin
     """
-    return "0x2::coin::Coin<0x2::sui::SUI>" in object_type
+    return object_type == _SUI_COIN
 
 
 def format_object_id(object_id: str) -> str: